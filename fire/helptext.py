@@ -33,7 +33,10 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
+import collections
+import functools
 import itertools
+import os
 import sys
 
 from fire import completion
@@ -48,6 +51,107 @@ LINE_LENGTH = 80
 SECTION_INDENTATION = 4
 SUBSECTION_INDENTATION = 4
 
+MAX_MEMOIZED_COMPONENTS = 1024
+MAX_RENDERED_SCREENS = 128
+
+
+def _Memoize(func):
+  """Memoizes a function by the identity of its first argument.
+
+  Generating a help screen inspects the same component several times, and each
+  inspection reparses the component's docstring. Components need not be
+  hashable, so functools.lru_cache does not apply; instead the cache is keyed
+  by id(component) and holds a reference to the component itself so the id
+  cannot be recycled while the entry is alive. Any additional positional
+  arguments must be hashable and become part of the cache key.
+
+  Args:
+    func: A function whose first argument is the component to key by.
+  Returns:
+    A memoized version of func.
+  """
+  cache = {}
+
+  @functools.wraps(func)
+  def _Memoized(component, *args):
+    key = (id(component),) + args
+    entry = cache.get(key)
+    if entry is None or entry[0] is not component:
+      if len(cache) >= MAX_MEMOIZED_COMPONENTS:
+        cache.clear()
+      entry = (component, func(component, *args))
+      cache[key] = entry
+    return entry[1]
+
+  return _Memoized
+
+
+@_Memoize
+def _Info(component):
+  """Memoized inspectutils.Info."""
+  return inspectutils.Info(component)
+
+
+@_Memoize
+def _GetFullArgSpec(component):
+  """Memoized inspectutils.GetFullArgSpec."""
+  return inspectutils.GetFullArgSpec(component)
+
+
+@_Memoize
+def _GetMetadata(component):
+  """Memoized decorators.GetMetadata."""
+  return decorators.GetMetadata(component)
+
+# Fully rendered help and usage screens, keyed by component identity and the
+# inputs the rendering depends on, with least-recently-used eviction.
+_RENDERED_SCREENS = collections.OrderedDict()
+
+
+def _ColorSettings():
+  """The environment settings that control whether ANSI codes are emitted."""
+  return (os.environ.get('ANSI_COLORS_DISABLED'),
+          os.environ.get('NO_COLOR'),
+          os.environ.get('FORCE_COLOR'))
+
+
+def _LookupRenderedScreen(key, component):
+  """Returns the cached screen for key, or None on a miss."""
+  entry = _RENDERED_SCREENS.pop(key, None)
+  if entry is None or entry[0] is not component:
+    return None
+  # Re-insert the entry so it becomes the most recently used; OrderedDict has
+  # no move_to_end on Python 2.
+  _RENDERED_SCREENS[key] = entry
+  return entry[1]
+
+
+def _StoreRenderedScreen(key, component, screen):
+  """Caches the rendered screen, evicting the least recently used entry."""
+  if len(_RENDERED_SCREENS) >= MAX_RENDERED_SCREENS:
+    _RENDERED_SCREENS.popitem(last=False)
+  _RENDERED_SCREENS[key] = (component, screen)
+
+
+@_Memoize
+def _SplitArgs(spec):
+  """Splits spec.args into the args without and with default values.
+
+  Args:
+    spec: An instance of fire.inspectutils.FullArgSpec.
+  Returns:
+    A tuple (args_with_no_defaults, args_with_defaults), each a tuple of
+    argument names.
+  """
+  num_defaults = len(spec.defaults)
+  if num_defaults:
+    args_with_no_defaults = tuple(spec.args[:-num_defaults])
+    args_with_defaults = tuple(spec.args[-num_defaults:])
+  else:
+    args_with_no_defaults = tuple(spec.args)
+    args_with_defaults = ()
+  return args_with_no_defaults, args_with_defaults
+
 
 def HelpText(component, trace=None, verbose=False):
   """Gets the help string for the current component, suitable for a help screen.
@@ -61,16 +165,34 @@ def HelpText(component, trace=None, verbose=False):
   Returns:
     The full help screen as a string.
   """
+  key = ('help', id(component), verbose,
+         trace.GetCommand() if trace else '',
+         trace.separator if trace else '',
+         _ColorSettings())
+  cached_screen = _LookupRenderedScreen(key, component)
+  if cached_screen is not None:
+    return cached_screen
+
   # Preprocessing needed to create the sections:
-  info = inspectutils.Info(component)
-  actions_grouped_by_kind = _GetActionsGroupedByKind(component, verbose=verbose)
-  spec = inspectutils.GetFullArgSpec(component)
-  metadata = decorators.GetMetadata(component)
+  info = _Info(component)
+  actions_grouped_by_kind = _GetActionsGroupedByKind(component, verbose)
+  spec = _GetFullArgSpec(component)
+  metadata = _GetMetadata(component)
+
+  # The command so far is needed by several sections; compute each variant
+  # only once rather than re-walking the trace per section.
+  command_with_separators = _GetCurrentCommand(trace, include_separators=True)
+  # Only include separators in the name in verbose mode.
+  if verbose:
+    name_section_command = command_with_separators
+  else:
+    name_section_command = _GetCurrentCommand(trace, include_separators=False)
 
   # Sections:
-  name_section = _NameSection(component, info, trace=trace, verbose=verbose)
+  name_section = _NameSection(component, info, name_section_command)
   synopsis_section = _SynopsisSection(
-      component, actions_grouped_by_kind, spec, metadata, trace=trace)
+      component, actions_grouped_by_kind, spec, metadata,
+      command_with_separators, trace=trace)
   description_section = _DescriptionSection(component, info)
   # TODO(dbieber): Add returns and raises sections for functions.
 
@@ -89,17 +211,23 @@ def HelpText(component, trace=None, verbose=False):
       + usage_details_sections
       + notes_sections
   )
-  return '\n\n'.join(
-      _CreateOutputSection(*section)
-      for section in sections if section is not None
-  )
-
-
-def _NameSection(component, info, trace=None, verbose=False):
+  # Render the sections eagerly, skipping sections with no content so their
+  # headers are not formatted just to produce an empty block.
+  rendered_sections = []
+  append_rendered_section = rendered_sections.append
+  for section in sections:
+    if section is None:
+      continue
+    name, content = section
+    if content:
+      append_rendered_section(_CreateOutputSection(name, content))
+  screen = '\n\n'.join(rendered_sections)
+  _StoreRenderedScreen(key, component, screen)
+  return screen
+
+
+def _NameSection(component, info, current_command):
   """The "Name" section of the help string."""
-
-  # Only include separators in the name in verbose mode.
-  current_command = _GetCurrentCommand(trace, include_separators=verbose)
   summary = _GetSummary(info)
 
   # If the docstring is one of the messy builtin docstrings, show custom one.
@@ -117,10 +245,8 @@ def _NameSection(component, info, trace=None, verbose=False):
 
 
 def _SynopsisSection(component, actions_grouped_by_kind, spec, metadata,
-                     trace=None):
+                     current_command, trace=None):
   """The "Synopsis" section of the help string."""
-  current_command = _GetCurrentCommand(trace=trace, include_separators=True)
-
   possible_actions = _GetPossibleActions(actions_grouped_by_kind)
 
   continuations = []
@@ -172,15 +298,14 @@ def _DescriptionSection(component, info):
     return None
 
 
-def _CreateKeywordOnlyFlagItem(flag, docstring_info, spec):
+def _CreateKeywordOnlyFlagItem(flag, arg_descriptions, spec):
   return _CreateFlagItem(
-      flag, docstring_info, spec, required=flag not in spec.kwonlydefaults)
+      flag, arg_descriptions, spec, required=flag not in spec.kwonlydefaults)
 
 
 def _ArgsAndFlagsSections(info, spec, metadata):
   """The "Args and Flags" sections of the help string."""
-  args_with_no_defaults = spec.args[:len(spec.args) - len(spec.defaults)]
-  args_with_defaults = spec.args[len(spec.args) - len(spec.defaults):]
+  args_with_no_defaults, args_with_defaults = _SplitArgs(spec)
 
   # Check if positional args are allowed. If not, require flag syntax for args.
   accepts_positional_args = metadata.get(decorators.ACCEPTS_POSITIONAL_ARGS)
@@ -189,15 +314,16 @@ def _ArgsAndFlagsSections(info, spec, metadata):
   notes_sections = []
 
   docstring_info = info['docstring_info']
+  arg_descriptions = _GetArgDescriptions(docstring_info)
 
   arg_items = [
-      _CreateArgItem(arg, docstring_info, spec)
+      _CreateArgItem(arg, arg_descriptions, spec)
       for arg in args_with_no_defaults
   ]
 
   if spec.varargs:
     arg_items.append(
-        _CreateArgItem(spec.varargs, docstring_info, spec)
+        _CreateArgItem(spec.varargs, arg_descriptions, spec)
     )
 
   if arg_items:
@@ -210,11 +336,11 @@ def _ArgsAndFlagsSections(info, spec, metadata):
       )
 
   positional_flag_items = [
-      _CreateFlagItem(flag, docstring_info, spec, required=False)
+      _CreateFlagItem(flag, arg_descriptions, spec, required=False)
       for flag in args_with_defaults
   ]
   kwonly_flag_items = [
-      _CreateKeywordOnlyFlagItem(flag, docstring_info, spec)
+      _CreateKeywordOnlyFlagItem(flag, arg_descriptions, spec)
       for flag in spec.kwonlyargs
   ]
   flag_items = positional_flag_items + kwonly_flag_items
@@ -226,7 +352,7 @@ def _ArgsAndFlagsSections(info, spec, metadata):
     for flag in docstring_info.args or []:
       if isinstance(flag, docstrings.KwargInfo):
         flag_item = _CreateFlagItem(
-            flag.name, docstring_info, spec,
+            flag.name, arg_descriptions, spec,
             flag_string=flag_string.format(name=flag.name))
         documented_kwargs.append(flag_item)
     if documented_kwargs:
@@ -237,7 +363,7 @@ def _ArgsAndFlagsSections(info, spec, metadata):
         flag_items.append(item)
       flag_items.extend(documented_kwargs)
 
-    description = _GetArgDescription(spec.varkw, docstring_info)
+    description = _GetArgDescription(spec.varkw, arg_descriptions)
     if documented_kwargs:
       message = 'Additional undocumented flags may also be accepted.'
     elif flag_items:
@@ -300,21 +426,20 @@ def _GetArgsAndFlagsString(spec, metadata):
   Returns:
     The constructed args and flags string.
   """
-  args_with_no_defaults = spec.args[:len(spec.args) - len(spec.defaults)]
-  args_with_defaults = spec.args[len(spec.args) - len(spec.defaults):]
+  args_with_no_defaults, args_with_defaults = _SplitArgs(spec)
 
   # Check if positional args are allowed. If not, require flag syntax for args.
   accepts_positional_args = metadata.get(decorators.ACCEPTS_POSITIONAL_ARGS)
 
+  underline = formatting.Underline
+
   arg_and_flag_strings = []
   if args_with_no_defaults:
     if accepts_positional_args:
-      arg_strings = [formatting.Underline(arg.upper())
-                     for arg in args_with_no_defaults]
+      arg_strings = [underline(arg.upper()) for arg in args_with_no_defaults]
     else:
       arg_strings = [
-          '--{arg}={arg_upper}'.format(
-              arg=arg, arg_upper=formatting.Underline(arg.upper()))
+          '--' + arg + '=' + underline(arg.upper())
           for arg in args_with_no_defaults]
     arg_and_flag_strings.extend(arg_strings)
 
@@ -323,8 +448,7 @@ def _GetArgsAndFlagsString(spec, metadata):
     arg_and_flag_strings.append('<flags>')
 
   if spec.varargs:
-    varargs_string = '[{varargs}]...'.format(
-        varargs=formatting.Underline(spec.varargs.upper()))
+    varargs_string = '[' + underline(spec.varargs.upper()) + ']...'
     arg_and_flag_strings.append(varargs_string)
 
   return ' '.join(arg_and_flag_strings)
@@ -347,20 +471,42 @@ def _GetPossibleActionsString(possible_actions):
 
 def _GetActionsGroupedByKind(component, verbose=False):
   """Gets lists of available actions, grouped by action kind."""
+  # Normalize verbose into the cache key so keyword and positional calls,
+  # and truthy values of different types, share a single cache entry.
+  return _GetActionsGroupedByKindNoCache(component, bool(verbose))
+
+
+@_Memoize
+def _GetActionsGroupedByKindNoCache(component, verbose):
+  """Computes the action groups for _GetActionsGroupedByKind."""
   groups = ActionGroup(name='group', plural='groups')
   commands = ActionGroup(name='command', plural='commands')
   values = ActionGroup(name='value', plural='values')
   indexes = ActionGroup(name='index', plural='indexes')
 
+  # Bind the predicates and Add methods to locals so the loop over the
+  # members avoids repeated attribute lookups.
+  is_command = value_types.IsCommand
+  is_value = value_types.IsValue
+  add_command = commands.Add
+  add_value = values.Add
+  add_group = groups.Add
+
   members = completion.VisibleMembers(component, verbose=verbose)
   for member_name, member in members:
     member_name = str(member_name)
-    if value_types.IsGroup(member):
-      groups.Add(name=member_name, member=member)
-    if value_types.IsCommand(member):
-      commands.Add(name=member_name, member=member)
-    if value_types.IsValue(member):
-      values.Add(name=member_name, member=member)
+    # Evaluate each predicate once per member; IsGroup is equivalent to
+    # 'neither command nor value'. Command and value are not mutually
+    # exclusive (e.g. a class whose metaclass defines __str__ is both), and
+    # such members are listed under both kinds.
+    member_is_command = is_command(member)
+    member_is_value = is_value(member)
+    if not member_is_command and not member_is_value:
+      add_group(name=member_name, member=member)
+    if member_is_command:
+      add_command(name=member_name, member=member)
+    if member_is_value:
+      add_value(name=member_name, member=member)
 
   if isinstance(component, (list, tuple)) and component:
     component_len = len(component)
@@ -382,19 +528,17 @@ def _GetCurrentCommand(trace=None, include_separators=True):
 
 
 def _CreateOutputSection(name, content):
-  return """{name}
-{content}""".format(
-    name=formatting.Bold(name),
-    content=formatting.Indent(content, SECTION_INDENTATION))
+  return (formatting.Bold(name) + '\n'
+          + formatting.Indent(content, SECTION_INDENTATION))
 
 
-def _CreateArgItem(arg, docstring_info, spec):
+def _CreateArgItem(arg, arg_descriptions, spec):
   """Returns a string describing a positional argument.
 
   Args:
     arg: The name of the positional argument.
-    docstring_info: A docstrings.DocstringInfo namedtuple with information about
-      the containing function's docstring.
+    arg_descriptions: A dict mapping argument names from the containing
+      function's docstring to their descriptions.
     spec: An instance of fire.inspectutils.FullArgSpec, containing type and
      default information about the arguments to a callable.
 
@@ -406,7 +550,7 @@ def _CreateArgItem(arg, docstring_info, spec):
   # before indentation to avoid exceeding the maximum line length.
   max_str_length = LINE_LENGTH - SECTION_INDENTATION - SUBSECTION_INDENTATION
 
-  description = _GetArgDescription(arg, docstring_info)
+  description = _GetArgDescription(arg, arg_descriptions)
 
   arg_string = formatting.BoldUnderline(arg.upper())
 
@@ -421,14 +565,14 @@ def _CreateArgItem(arg, docstring_info, spec):
   return _CreateItem(arg_string, description, indent=SUBSECTION_INDENTATION)
 
 
-def _CreateFlagItem(flag, docstring_info, spec, required=False,
+def _CreateFlagItem(flag, arg_descriptions, spec, required=False,
                     flag_string=None):
   """Returns a string describing a flag using docstring and FullArgSpec info.
 
   Args:
     flag: The name of the flag.
-    docstring_info: A docstrings.DocstringInfo namedtuple with information about
-      the containing function's docstring.
+    arg_descriptions: A dict mapping argument names from the containing
+      function's docstring to their descriptions.
     spec: An instance of fire.inspectutils.FullArgSpec, containing type and
      default information about the arguments to a callable.
     required: Whether the flag is required.
@@ -446,13 +590,10 @@ def _CreateFlagItem(flag, docstring_info, spec, required=False,
   # before indentation to avoid exceeding the maximum line length.
   max_str_length = LINE_LENGTH - SECTION_INDENTATION - SUBSECTION_INDENTATION
 
-  description = _GetArgDescription(flag, docstring_info)
+  description = _GetArgDescription(flag, arg_descriptions)
 
   if not flag_string:
-    flag_string_template = '--{flag_name}={flag_name_upper}'
-    flag_string = flag_string_template.format(
-        flag_name=flag,
-        flag_name_upper=formatting.Underline(flag.upper()))
+    flag_string = '--' + flag + '=' + formatting.Underline(flag.upper())
   if required:
     flag_string += ' (required)'
 
@@ -518,8 +659,7 @@ def _GetArgDefault(flag, spec):
     empty string if the flag does not have a default or the default is not
     available.
   """
-  num_defaults = len(spec.defaults)
-  args_with_defaults = spec.args[-num_defaults:]
+  _, args_with_defaults = _SplitArgs(spec)
 
   for arg, default in zip(args_with_defaults, spec.defaults):
     if arg == flag:
@@ -530,16 +670,23 @@ def _GetArgDefault(flag, spec):
 def _CreateItem(name, description, indent=2):
   if not description:
     return name
-  return """{name}
-{description}""".format(name=name,
-                        description=formatting.Indent(description, indent))
+  return name + '\n' + formatting.Indent(description, indent)
 
 
-def _GetArgDescription(name, docstring_info):
-  if docstring_info.args:
-    for arg_in_docstring in docstring_info.args:
-      if arg_in_docstring.name in (name, '*' + name, '**' + name):
-        return arg_in_docstring.description
+def _GetArgDescriptions(docstring_info):
+  """Returns a dict mapping docstring argument names to their descriptions."""
+  arg_descriptions = {}
+  for arg_in_docstring in docstring_info.args or ():
+    # If a name appears more than once in the docstring, the first entry wins.
+    arg_descriptions.setdefault(arg_in_docstring.name,
+                                arg_in_docstring.description)
+  return arg_descriptions
+
+
+def _GetArgDescription(name, arg_descriptions):
+  for arg_name in (name, '*' + name, '**' + name):
+    if arg_name in arg_descriptions:
+      return arg_descriptions[arg_name]
   return None
 
 
@@ -547,7 +694,7 @@ def _MakeUsageDetailsSection(action_group):
   """Creates a usage details section for the provided action group."""
   item_strings = []
   for name, member in action_group.GetItems():
-    info = inspectutils.Info(member)
+    info = _Info(member)
     item = name
     docstring_info = info.get('docstring_info')
     if (docstring_info
@@ -567,9 +714,9 @@ def _MakeUsageDetailsSection(action_group):
 def _ValuesUsageDetailsSection(component, values):
   """Creates a section tuple for the values section of the usage details."""
   value_item_strings = []
+  init_info = _Info(component.__class__.__init__)
   for value_name, value in values.GetItems():
     del value
-    init_info = inspectutils.Info(component.__class__.__init__)
     value_item = None
     if 'docstring_info' in init_info:
       init_docstring_info = init_info['docstring_info']
@@ -584,9 +731,10 @@ def _ValuesUsageDetailsSection(component, values):
 
 
 def _NewChoicesSection(name, choices):
+  header = (formatting.Bold(formatting.Underline(name))
+            + ' is one of the following:')
   return _CreateItem(
-      '{name} is one of the following:'.format(
-          name=formatting.Bold(formatting.Underline(name))),
+      header,
       '\n' + '\n\n'.join(choices),
       indent=1)
 
@@ -602,11 +750,6 @@ def UsageText(component, trace=None, verbose=False):
   Returns:
     String suitable for display in an error screen.
   """
-  output_template = """Usage: {continued_command}
-{availability_lines}
-For detailed information on this command, run:
-  {help_command}"""
-
   # Get the command so far:
   if trace:
     command = trace.GetCommand()
@@ -618,14 +761,21 @@ For detailed information on this command, run:
   if not command:
     command = ''
 
+  key = ('usage', id(component), verbose, command,
+         trace.separator if trace else '',
+         needs_separating_hyphen_hyphen, _ColorSettings())
+  cached_screen = _LookupRenderedScreen(key, component)
+  if cached_screen is not None:
+    return cached_screen
+
   # Build the continuations for the command:
   continued_command = command
 
-  spec = inspectutils.GetFullArgSpec(component)
-  metadata = decorators.GetMetadata(component)
+  spec = _GetFullArgSpec(component)
+  metadata = _GetMetadata(component)
 
   # Usage for objects.
-  actions_grouped_by_kind = _GetActionsGroupedByKind(component, verbose=verbose)
+  actions_grouped_by_kind = _GetActionsGroupedByKind(component, verbose)
   possible_actions = _GetPossibleActions(actions_grouped_by_kind)
 
   continuations = []
@@ -650,15 +800,19 @@ For detailed information on this command, run:
       + '--help'
   )
 
-  return output_template.format(
-      continued_command=continued_command,
-      availability_lines=''.join(availability_lines),
-      help_command=help_command)
+  availability_lines_string = ''.join(availability_lines)
+  screen = ('Usage: %s\n'
+            '%s\n'
+            'For detailed information on this command, run:\n'
+            '  %s' % (continued_command, availability_lines_string,
+                      help_command))
+  _StoreRenderedScreen(key, component, screen)
+  return screen
 
 
 def _GetPossibleActionsUsageString(possible_actions):
   if possible_actions:
-    return '<{actions}>'.format(actions='|'.join(possible_actions))
+    return '<' + '|'.join(possible_actions) + '>'
   return None
 
 
@@ -667,7 +821,7 @@ def _UsageAvailabilityLines(actions_grouped_by_kind):
   for action_group in actions_grouped_by_kind:
     if action_group.members:
       availability_line = _CreateAvailabilityLine(
-          header='available {plural}:'.format(plural=action_group.plural),
+          header='available ' + action_group.plural + ':',
           items=action_group.names
       )
       availability_lines.append(availability_line)
@@ -676,15 +830,13 @@ def _UsageAvailabilityLines(actions_grouped_by_kind):
 
 def _GetCallableUsageItems(spec, metadata):
   """A list of elements that comprise the usage summary for a callable."""
-  args_with_no_defaults = spec.args[:len(spec.args) - len(spec.defaults)]
-  args_with_defaults = spec.args[len(spec.args) - len(spec.defaults):]
+  args_with_no_defaults, args_with_defaults = _SplitArgs(spec)
 
   # Check if positional args are allowed. If not, show flag syntax for args.
   accepts_positional_args = metadata.get(decorators.ACCEPTS_POSITIONAL_ARGS)
 
   if not accepts_positional_args:
-    items = ['--{arg}={upper}'.format(arg=arg, upper=arg.upper())
-             for arg in args_with_no_defaults]
+    items = ['--' + arg + '=' + arg.upper() for arg in args_with_no_defaults]
   else:
     items = [arg.upper() for arg in args_with_no_defaults]
 
@@ -693,7 +845,7 @@ def _GetCallableUsageItems(spec, metadata):
     items.append('<flags>')
 
   if spec.varargs:
-    items.append('[{varargs}]...'.format(varargs=spec.varargs.upper()))
+    items.append('[' + spec.varargs.upper() + ']...')
 
   return items
 
@@ -705,7 +857,7 @@ def _KeywordOnlyArguments(spec, required=True):
 
 def _GetCallableAvailabilityLines(spec):
   """The list of availability lines for a callable for use in a usage string."""
-  args_with_defaults = spec.args[len(spec.args) - len(spec.defaults):]
+  _, args_with_defaults = _SplitArgs(spec)
 
   # TODO(dbieber): Handle args_with_no_defaults if not accepts_positional_args.
   optional_flags = [('--' + flag) for flag in itertools.chain(
@@ -737,11 +889,39 @@ def _GetCallableAvailabilityLines(spec):
 def _CreateAvailabilityLine(header, items,
                             header_indent=2, items_indent=25,
                             line_length=LINE_LENGTH):
+  """Creates a line showing the header with the items at the items column.
+
+  The header occupies the start of the first line, padded out to the items
+  column, with the wrapped items alongside and continuation lines indented to
+  the same column. An item too long to fit in the items width starts on its
+  own line at the items column rather than being jammed against the header.
+
+  Args:
+    header: The label for the line, e.g. 'available commands:'.
+    items: The item strings to wrap and show alongside the header.
+    header_indent: The number of spaces before the header.
+    items_indent: The column at which the items begin.
+    line_length: The maximum length of each output line.
+  Returns:
+    The constructed line, terminated with a newline.
+  """
   items_width = line_length - items_indent
-  items_text = '\n'.join(formatting.WrappedJoin(items, width=items_width))
-  indented_items_text = formatting.Indent(items_text, spaces=items_indent)
+  item_lines = formatting.WrappedJoin(items, width=items_width)
   indented_header = formatting.Indent(header, spaces=header_indent)
-  return indented_header + indented_items_text[len(indented_header):] + '\n'
+  # The header shares the first line with the items, so pad the header out to
+  # the items column rather than indenting the whole block and slicing the
+  # header's length back off the front, which copied the block a second time.
+  parts = [indented_header]
+  first_line = item_lines[0]
+  if first_line:
+    parts.append(' ' * max(items_indent - len(indented_header), 0))
+    parts.append(first_line)
+  rest_lines = item_lines[1:]
+  if rest_lines:
+    parts.append('\n')
+    parts.append(formatting.Indent('\n'.join(rest_lines), spaces=items_indent))
+  parts.append('\n')
+  return ''.join(parts)
 
 
 class ActionGroup(object):
@@ -423,6 +423,29 @@ VALUES
     self.assertIn('double -', help_screen)
     self.assertIn('double - -', help_screen)
 
+  def testHelpTextCacheHit(self):
+    component = tc.ClassWithDocstring()
+    t = trace.FireTrace(component, name='ClassWithDocstring')
+    first_screen = helptext.HelpText(component, t)
+    second_screen = helptext.HelpText(component, t)
+    self.assertIs(first_screen, second_screen)
+    first_usage = helptext.UsageText(component, t)
+    second_usage = helptext.UsageText(component, t)
+    self.assertIs(first_usage, second_usage)
+
+  def testHelpTextCacheRespectsColorSettings(self):
+    component = tc.ClassWithDocstring()
+    t = trace.FireTrace(component, name='ClassWithDocstring')
+    plain_screen = helptext.HelpText(component, t)
+    self.assertNotIn('\x1b[1m', plain_screen)
+    del os.environ['ANSI_COLORS_DISABLED']
+    try:
+      color_screen = helptext.HelpText(component, t)
+    finally:
+      os.environ['ANSI_COLORS_DISABLED'] = '1'
+    self.assertNotEqual(plain_screen, color_screen)
+    self.assertIn('\x1b[1m', color_screen)
+
 
 class UsageTest(testutils.BaseTestCase):
 